@@ -13,6 +13,8 @@ import math
 import os
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from pytz import timezone
 
@@ -22,24 +24,44 @@ SENSOR_API_URL = os.getenv('SENSOR_API_URL')
 BEARER_TOKEN = os.getenv('BEARER_TOKEN')
 MAX_LUX = 10000
 
+# Light curve shape. Derived terms are computed once here rather than on every
+# one of the 5760 calls generate_light_intensity makes per run.
+PERIOD_MINUTES = 120  # 2 hours
+PEAK_MINUTE = 720  # Midday
+STD_DEV = 300  # Controls the width of the bell curve
+RADIANS_PER_MINUTE = 2 * math.pi / PERIOD_MINUTES
+INV_TWO_VARIANCE = 1.0 / (2 * STD_DEV ** 2)
+INTENSITY_RANGE = MAX_LUX - 10
+
+# Timestamps are jittered by up to this many seconds either way
+TIMESTAMP_JITTER_SECONDS = range(-5, 6)
+
+# One HTTP session for the life of the instance, so the four POSTs in a run share
+# a keep-alive connection and warm invocations skip the TLS handshake entirely.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=None)
+))
+session.headers.update({
+    'Authorization': f'Bearer {BEARER_TOKEN}',
+    'Content-Type': 'application/json'
+})
+
 def generate_light_intensity(minute, phase_shift=0):
     """
     Generate light intensity based on a sine wave and bell curve.
     """
-    # Sine wave component
-    period_minutes = 120  # 2 hours
-    radians = (2 * math.pi * minute) / period_minutes + phase_shift
-    sine_value = (math.sin(radians) + 1) / 2  # Normalize sine to [0,1]
+    # Sine wave component, normalized to [0,1]
+    sine_value = (math.sin(RADIANS_PER_MINUTE * minute + phase_shift) + 1) * 0.5
 
     # Bell curve (Gaussian) component
-    peak_minute = 720  # Midday
-    std_dev = 300  # Controls the width of the bell curve
-    bell_curve = math.exp(-((minute - peak_minute) ** 2) / (2 * std_dev ** 2))
+    offset = minute - PEAK_MINUTE
+    bell_curve = math.exp(-offset * offset * INV_TWO_VARIANCE)
 
     # Combine sine wave and bell curve
-    max_intensity = bell_curve * (MAX_LUX - 10)
-    light = sine_value * max_intensity + 10
-    return light
+    return sine_value * bell_curve * INTENSITY_RANGE + 10
 
 def generate_and_send_data(request):
     """
@@ -52,10 +74,6 @@ def generate_and_send_data(request):
         return error_msg, 500
 
     cst = timezone('America/Chicago')
-    headers = {
-        'Authorization': f'Bearer {BEARER_TOKEN}',
-        'Content-Type': 'application/json'
-    }
 
     # Generate data for the current day, starting at midnight CST
     start_time_cst = datetime.now(cst).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -67,9 +85,12 @@ def generate_and_send_data(request):
         sensor_id = f"{SENSOR_ID}_{sensor_number}"
         phase_shift = (sensor_number * math.pi) / 2
 
+        # Draw the whole day's jitter in one call instead of one randint per minute
+        random_offsets = random.choices(TIMESTAMP_JITTER_SECONDS, k=1440)
+
         records = []
         for minute in range(1440):  # 1440 minutes in a day
-            random_offset = random.randint(-5, 5)
+            random_offset = random_offsets[minute]
             timestamp = start_time_utc + timedelta(minutes=minute, seconds=random_offset)
             iso_timestamp = timestamp.isoformat().replace('+00:00', 'Z')
             light_intensity = generate_light_intensity(minute, phase_shift)
@@ -83,7 +104,7 @@ def generate_and_send_data(request):
             records.append(record)
 
         try:
-            response = requests.post(SENSOR_API_URL, headers=headers, json=records)
+            response = session.post(SENSOR_API_URL, json=records)
             print(f"Sent {len(records)} records for sensor {sensor_id} -> Status {response.status_code}")
             if not response.ok:
                 print(f"Error response: {response.text}")
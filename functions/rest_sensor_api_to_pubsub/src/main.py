@@ -7,13 +7,23 @@ Copyright (c) 2025 Caden Howell (cadenhowell@gmail.com)
 Developed with assistance from ChatGPT 4o (2025) and Google Gemini 2.5 Pro (2025).
 Apache 2.0 Licensed as described in the file LICENSE
 """
-import os
+import codecs
 import json
+import os
 from google.cloud import pubsub_v1
 import functions_framework
 
 # Initialize the publisher client once globally. It's safe and efficient.
-publisher = pubsub_v1.PublisherClient()
+# Each request publishes exactly one message and waits for it, so there is nothing
+# to batch; sending each message immediately skips the client's batching delay.
+publisher = pubsub_v1.PublisherClient(
+    batch_settings=pubsub_v1.types.BatchSettings(max_messages=1)
+)
+
+# How long to wait for Pub/Sub to acknowledge a publish before failing the request.
+# The function must wait: Cloud Functions throttles CPU once the response is sent,
+# so a publish left pending in the background could be lost.
+PUBLISH_TIMEOUT_SECONDS = 10
 
 
 @functions_framework.http
@@ -47,21 +57,22 @@ def proxy_to_pubsub(request):
 
     # --- Log Raw Request Body for Debugging ---
     try:
-        raw_body = request.get_data(as_text=True)
-        print(f"DEBUG: Raw request body (length {len(raw_body)}): {raw_body}")
+        raw_body = request.get_data()
+        print(f"DEBUG: Raw request body (length {len(raw_body)}): {raw_body.decode('utf-8', 'replace')}")
     except Exception as e:
         print(f"ERROR: Could not read raw request body: {e}")
         return ("Bad Request: Could not read request body.", 400)
 
     # --- JSON Payload Validation ---
+    # The body is parsed only to validate it. The raw bytes are what gets published,
+    # so the payload is never serialized a second time. The standard library parser
+    # accepts the same bodies Flask's get_json did, including NaN and Infinity.
+    # A UTF-8 byte order mark is dropped so a wrapped object is still valid JSON.
+    raw_body = raw_body.removeprefix(codecs.BOM_UTF8)
     try:
-        data = request.get_json(silent=True)
+        data = json.loads(raw_body)
         print(f"DEBUG: Parsed JSON type: {type(data)}")
 
-        if data is None:
-            print("ERROR: JSON parsing returned None")
-            return ("Bad Request: Invalid JSON format.", 400)
-
         # Log the structure for debugging
         if isinstance(data, list):
             print(f"DEBUG: Received array with {len(data)} items")
@@ -76,7 +87,10 @@ def proxy_to_pubsub(request):
         if isinstance(data, dict):
             print("INFO: Converting single object to array")
             data = [data]
-        elif not isinstance(data, list):
+            message_data = b"[" + raw_body + b"]"
+        elif isinstance(data, list):
+            message_data = raw_body
+        else:
             print(f"ERROR: JSON body must be a list or object, got {type(data)}")
             return ("Bad Request: JSON body must be a list of sensor readings or a single object.", 400)
 
@@ -92,11 +106,10 @@ def proxy_to_pubsub(request):
     # --- Publish to Pub/Sub ---
     try:
         topic_path = publisher.topic_path(project_id, topic_id)
-        message_data = json.dumps(data).encode("utf-8")
         print(f"DEBUG: Publishing message of {len(message_data)} bytes to {topic_path}")
 
         future = publisher.publish(topic_path, data=message_data)
-        message_id = future.result(timeout=10)
+        message_id = future.result(timeout=PUBLISH_TIMEOUT_SECONDS)
 
         print(f"INFO: Successfully published message {message_id} to {topic_path}")
         return (f"Message received and published with ID: {message_id}", 200)
@@ -21,6 +21,8 @@ from functions.rest_sensor_api_to_pubsub.src.main import proxy_to_pubsub
 
 # Mock the Flask request object to simulate HTTP requests
 class MockRequest:
+    __slots__ = ("headers", "json_data", "content_type", "_raw_body")
+
     def __init__(self, headers=None, json_data=None, content_type='application/json'):
         self.headers = headers if headers is not None else {}
         self.json_data = json_data
@@ -73,8 +75,8 @@ class TestProxyToPubSub(unittest.TestCase):
         self.assertEqual(status_code, 200)
         self.assertIn("mock-message-id-12345", response)
 
-        # Verify that publisher.publish was called correctly
-        expected_data = json.dumps(payload).encode("utf-8")
+        # Verify that publisher.publish was called with the request body unchanged
+        expected_data = request.get_data()
         mock_publisher.publish.assert_called_once_with('projects/test-project/topics/test-topic', data=expected_data)
 
     @patch('functions.rest_sensor_api_to_pubsub.src.main.publisher', new_callable=MagicMock)
@@ -117,7 +119,7 @@ class TestProxyToPubSub(unittest.TestCase):
         self.assertIn("mock-message-id-67890", response)
 
         # Verify that publisher.publish was called with the object wrapped in an array
-        expected_data = json.dumps([payload]).encode("utf-8")
+        expected_data = b"[" + request.get_data() + b"]"
         mock_publisher.publish.assert_called_once_with('projects/test-project/topics/test-topic', data=expected_data)
 
     @patch.dict('os.environ', {
@@ -186,6 +188,51 @@ class TestProxyToPubSub(unittest.TestCase):
         self.assertEqual(status_code, 400)
         self.assertIn("JSON body must be a list of sensor readings or a single object", response)
 
+    @patch.dict('os.environ', {
+        'GCP_PROJECT': 'test-project',
+        'TOPIC_ID': 'test-topic',
+        'SECRET_BEARER_TOKEN': 'test-token-123',
+    })
+    def test_invalid_json_body(self):
+        """
+        Tests that a body that is not valid JSON results in a 400 Bad Request error.
+        """
+        headers = {
+            'Authorization': 'Bearer test-token-123',
+            'Content-Type': 'application/json'
+        }
+        request = MockRequest(headers=headers, json_data=None)
+        response, status_code = proxy_to_pubsub(request)
+        self.assertEqual(status_code, 400)
+        self.assertIn("Invalid JSON format", response)
+
+    @patch('functions.rest_sensor_api_to_pubsub.src.main.publisher', new_callable=MagicMock)
+    @patch.dict('os.environ', {
+        'GCP_PROJECT': 'test-project',
+        'TOPIC_ID': 'test-topic',
+        'SECRET_BEARER_TOKEN': 'test-token-123',
+    })
+    def test_nan_values_accepted(self, mock_publisher):
+        """
+        Tests that NaN and Infinity values are accepted, as Flask's get_json did.
+        """
+        mock_publisher.topic_path.return_value = 'projects/test-project/topics/test-topic'
+
+        mock_future = MagicMock()
+        mock_future.result.return_value = "mock-message-id-nan"
+        mock_publisher.publish.return_value = mock_future
+
+        headers = {
+            'Authorization': 'Bearer test-token-123',
+            'Content-Type': 'application/json'
+        }
+        payload = [{'sensor_id': 'sensor_1', 'light_intensity': float('nan'), 'battery_voltage': float('inf')}]
+        request = MockRequest(headers=headers, json_data=payload)
+        response, status_code = proxy_to_pubsub(request)
+
+        self.assertEqual(status_code, 200)
+        mock_publisher.publish.assert_called_once_with('projects/test-project/topics/test-topic', data=request.get_data())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -9,33 +9,118 @@ Developed with assistance from Claude Sonnet 4.5 (2025).
 Apache 2.0 Licensed as described in the file LICENSE
 """
 import os
-import json
 import base64
-import collections
+import hashlib
+import json
+import operator
+import sys
+import threading
+import time
 import smtplib
-import urllib.request
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+import orjson
+import urllib3
+from urllib3.util.retry import Retry
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 from cassandra import ConsistencyLevel
 from google.cloud import storage
 import functions_framework
 
+# Buffer stdout instead of flushing on every print; process_sensor_data flushes
+# once before returning so Cloud Logging still sees output before the instance freezes.
+sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
 # Global connection - initialized once and reused across function invocations
 cassandra_session = None
 astra_keyspace = None
 
+# Global Gmail SMTP connection - reused across invocations while it stays alive.
+# Only one thread may use it at a time.
+smtp_server = None
+_smtp_lock = threading.Lock()
+SMTP_TIMEOUT_SECONDS = 10
+
 # Enable/disable Pushover notifications
 ENABLE_PUSHOVER = True
 
+PUSHOVER_API_URL = "https://api.pushover.net/1/messages.json"
+
+# HTTPS connection pool for Pushover, kept alive across warm invocations
+# so each notification doesn't pay for a new TLS handshake.
+# Sized to match _send_pool so concurrent sends don't overflow it.
+# The timeouts keep a stalled connection from holding a send worker forever. Only
+# connection failures are retried for a POST, so a send gives up within
+# 3 * PUSHOVER_CONNECT_TIMEOUT_SECONDS + PUSHOVER_READ_TIMEOUT_SECONDS, well inside
+# STATUS_PROCESSING_DEADLINE_SECONDS.
+PUSHOVER_CONNECT_TIMEOUT_SECONDS = 5
+PUSHOVER_READ_TIMEOUT_SECONDS = 10
+_PUSHOVER_POOL = urllib3.PoolManager(
+    maxsize=16,
+    retries=Retry(total=2, backoff_factor=0.1),
+    timeout=urllib3.Timeout(connect=PUSHOVER_CONNECT_TIMEOUT_SECONDS, read=PUSHOVER_READ_TIMEOUT_SECONDS)
+)
+
 # NEW FLAG: Controls whether data is written to Cassandra.
 # Reads value from environment variable, defaulting to "True".
 # Any value other than "True" (case-insensitive) will be treated as False.
 ENABLE_CASSANDRA_WRITE = os.environ.get('ENABLE_CASSANDRA_WRITE', 'True').lower() == 'true'
 
+# Notification settings. Environment variables don't change for the life of an
+# instance, so read them once at startup rather than on every notification.
+PUSHOVER_APP_TOKEN = os.environ.get('PUSHOVER_APP_TOKEN')
+PUSHOVER_BATTERY_APP_TOKEN = os.environ.get('PUSHOVER_BATTERY_APP_TOKEN')
+PUSHOVER_USER_KEY = os.environ.get('PUSHOVER_USER_KEY')
+ALERT_EMAIL_ADDRESS = os.environ.get('ALERT_EMAIL_ADDRESS')
+GMAIL_USER = os.environ.get('GMAIL_USER')
+GMAIL_APP_PASSWORD = os.environ.get('GMAIL_APP_PASSWORD')
+
+PUSHOVER_CONFIGURED = bool(PUSHOVER_APP_TOKEN and PUSHOVER_USER_KEY)
+EMAIL_CONFIGURED = bool(ALERT_EMAIL_ADDRESS and GMAIL_USER and GMAIL_APP_PASSWORD)
+
+if not PUSHOVER_CONFIGURED:
+    print("WARN: Pushover is not configured, notifications will be skipped")
+if not EMAIL_CONFIGURED:
+    print("WARN: Email is not configured, notifications will be skipped")
+
+# Ping summary logs embed every reading up to this many points; larger groups
+# only embed the first few readings plus a count to keep log entries small.
+PING_LOG_PAYLOAD_LIMIT = 10
+PING_LOG_SAMPLE_SIZE = 3
+
+# Cloud Logging rejects entries over 256 KB, so embedded payloads that encode
+# larger than this are replaced with a count and SHA-256 digest.
+LOG_PAYLOAD_MAX_BYTES = 200_000
+
+# Status messages starting with any of these are battery reports
+BATTERY_STATUS_PREFIXES = ("[boot] battery", "[wake] battery")
+
+# Message template for the per-sensor ping summary logs
+PING_LOG_MESSAGE = "{num_points} data points received from {sensor_id}"
+
+# Time from the start of an invocation after which process_sensor_data stops waiting
+# for status processing and notifications. Kept well under the 60s function timeout
+# (see deploy_sensor_data_processor.yml) so whatever time the Cassandra write used,
+# the status logs can still be written and stdout flushed before the instance is cut off.
+STATUS_PROCESSING_DEADLINE_SECONDS = 50
+
+# Worker threads for status notifications, which run alongside the Cassandra write.
+# Kept at module level so warm instances reuse the same threads.
+_notify_pool = ThreadPoolExecutor(max_workers=4)
+
+# Worker threads for individual email and Pushover sends, so notifications for
+# different status messages overlap instead of running one after another.
+_send_pool = ThreadPoolExecutor(max_workers=16)
+
+# Fetches the (sensor_set_id, sensor_id) grouping key from a reading in one call
+_get_sensor_key = operator.itemgetter("sensor_set_id", "sensor_id")
+
+# Built-in isinstance(x, dict) check, usable directly as a filter() predicate
+_is_dict = dict.__instancecheck__
+
 
 def get_cassandra_session():
     """
@@ -86,15 +171,13 @@ def get_cassandra_session():
     return cassandra_session
 
 
-def update_latest_reading(session, reading, timestamp, ingestion_time):
+def update_latest_reading(session, sensor_id, sensor_set_id, reading, timestamp, ingestion_time):
     """
     Update the latest reading cache table.
     Only updates fields that are present in the reading, preserving other fields.
     Uses Cassandra's UPSERT semantics to merge updates.
+    The sensor_id and sensor_set_id are passed in already resolved by the caller.
     """
-    sensor_id = reading.get('sensor_id')
-    sensor_set_id = reading.get('sensor_set_id')
-
     if not sensor_id:
         return
 
@@ -192,22 +275,18 @@ def send_pushover_notification(sensor_id, sensor_set_id, status_message, use_bat
 
     # Determine which token to use
     if use_battery_token:
-        token = os.environ.get('PUSHOVER_BATTERY_APP_TOKEN')
+        token = PUSHOVER_BATTERY_APP_TOKEN
         if not token:
             print("WARN: PUSHOVER_BATTERY_APP_TOKEN not configured, falling back to general token")
-            token = os.environ.get('PUSHOVER_APP_TOKEN')
+            token = PUSHOVER_APP_TOKEN
     else:
-        token = os.environ.get('PUSHOVER_APP_TOKEN')
-
-    pushover_user = os.environ.get('PUSHOVER_USER_KEY')
+        token = PUSHOVER_APP_TOKEN
 
-    if not all([token, pushover_user]):
+    if not (token and PUSHOVER_USER_KEY):
         print("WARN: Pushover not configured, skipping notification")
         return
 
     try:
-        url = "https://api.pushover.net/1/messages.json"
-
         # Build message based on type
         if use_battery_token and battery_data:
             voltage = battery_data.get('battery_voltage', 'N/A')
@@ -225,22 +304,16 @@ def send_pushover_notification(sensor_id, sensor_set_id, status_message, use_bat
         # Create the message data
         data = {
             'token': token,
-            'user': pushover_user,
+            'user': PUSHOVER_USER_KEY,
             'title': title,
             'message': message,
             'priority': 0,
             'sound': pushover_sound
         }
 
-        # Encode data for POST request
-        encoded_data = urllib.parse.urlencode(data).encode('utf-8')
-
-        # Create and send request
-        req = urllib.request.Request(url, data=encoded_data)
-        req.add_header('Content-Type', 'application/x-www-form-urlencoded')
-
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
+        # Send as a form-encoded POST over the pooled connection
+        response = _PUSHOVER_POOL.request('POST', PUSHOVER_API_URL, fields=data, encode_multipart=False)
+        result = orjson.loads(response.data)
 
         if result.get('status') == 1:
             app_type = "battery" if use_battery_token else "general"
@@ -252,27 +325,45 @@ def send_pushover_notification(sensor_id, sensor_set_id, status_message, use_bat
         print(f"ERROR: Failed to send Pushover notification: {e}")
 
 
-def send_status_notification(sensor_id, sensor_set_id, status_message):
+def get_smtp_server():
     """
-    Send email and Pushover notifications for status messages.
-    Uses Gmail SMTP for email and Pushover API for push notifications.
+    Return a logged-in Gmail SMTP connection, reusing the one from a previous
+    invocation if it still answers a NOOP and reconnecting otherwise.
+    Callers must hold _smtp_lock.
     """
-    email_address = os.environ.get('ALERT_EMAIL_ADDRESS')
-    gmail_user = os.environ.get('GMAIL_USER')
-    gmail_app_password = os.environ.get('GMAIL_APP_PASSWORD')
+    global smtp_server
 
-    if not all([email_address, gmail_user, gmail_app_password]):
-        print("ERROR: Missing email configuration environment variables")
-        return
+    if smtp_server is not None:
+        try:
+            if smtp_server.noop()[0] == 250:
+                return smtp_server
+        except (smtplib.SMTPException, OSError):
+            pass
+        print("INFO: SMTP connection is no longer alive, reconnecting")
+        try:
+            smtp_server.close()
+        except OSError:
+            pass
+        smtp_server = None
 
-    # Email notification
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = gmail_user
-        msg['To'] = email_address
-        msg['Subject'] = f"ℹ️ Sensor Status: {sensor_id} - {status_message}"
+    # Connect to Gmail SMTP
+    server = smtplib.SMTP('smtp.gmail.com', 587, timeout=SMTP_TIMEOUT_SECONDS)
+    server.starttls()
+    server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+    smtp_server = server
+    return smtp_server
 
-        body = f"""
+
+def build_status_email(sensor_id, sensor_set_id, status_message):
+    """
+    Build the informational email for a single status message.
+    """
+    msg = MIMEMultipart()
+    msg['From'] = GMAIL_USER
+    msg['To'] = ALERT_EMAIL_ADDRESS
+    msg['Subject'] = f"ℹ️ Sensor Status: {sensor_id} - {status_message}"
+
+    body = f"""
 Sensor Status Update
 
 Sensor: {sensor_id}
@@ -282,41 +373,133 @@ Status: {status_message}
 This is informational only - no action required.
         """
 
-        msg.attach(MIMEText(body, 'plain'))
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
 
-        # Connect to Gmail SMTP
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(gmail_user, gmail_app_password)
 
-        # Send email
-        server.send_message(msg)
-        server.quit()
+def send_status_email_batch(statuses):
+    """
+    Send email notifications for a batch of status messages.
+    Each status is a (sensor_id, sensor_set_id, status_message) tuple.
+    All emails share the module's Gmail SMTP connection, so the TLS handshake
+    and login are only repeated when that connection has dropped.
+    """
+    if not statuses:
+        return
+
+    if not EMAIL_CONFIGURED:
+        print("ERROR: Missing email configuration environment variables")
+        return
 
-        print(f"INFO: Email notification sent for sensor {sensor_id}")
+    # Build every message up front so the SMTP session is only held open for sending
+    messages = [
+        (sensor_id, build_status_email(sensor_id, sensor_set_id, status_message))
+        for sensor_id, sensor_set_id, status_message in statuses
+    ]
+
+    # Email notifications
+    try:
+        with _smtp_lock:
+            server = get_smtp_server()
+            for sensor_id, msg in messages:
+                try:
+                    # Send email
+                    try:
+                        server.send_message(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        # The connection dropped mid-batch, so reconnect and retry once
+                        server = get_smtp_server()
+                        server.send_message(msg)
+                    print(f"INFO: Email notification sent for sensor {sensor_id}")
+                except Exception as e:
+                    # Keep going so one bad message doesn't abort the rest of the batch
+                    print(f"ERROR: Failed to send email notification for sensor {sensor_id}: {e}")
 
     except Exception as e:
-        print(f"ERROR: Failed to send email notification: {e}")
+        print(f"ERROR: Failed to send email notifications: {e}")
+
+
+def log_payload_field(payload):
+    """
+    Encode a payload for the data_payload field of a structured log entry.
+    The encoded bytes are wrapped in an orjson.Fragment so they are embedded
+    as-is when the entry is serialized, rather than encoded a second time.
+    Payloads over LOG_PAYLOAD_MAX_BYTES are replaced with a count and digest.
+    """
+    encoded = orjson.dumps(payload)
+    if len(encoded) > LOG_PAYLOAD_MAX_BYTES:
+        count = len(payload) if isinstance(payload, list) else 1
+        return {"count": count, "sha256": hashlib.sha256(encoded).hexdigest()}
+    return orjson.Fragment(encoded)
+
 
-    # Pushover notification
-    send_pushover_notification(sensor_id, sensor_set_id, status_message)
+def append_log_line(log_buffer, entry):
+    """
+    Serialize a structured log entry onto the end of a log buffer as one
+    newline-terminated JSON line.
+    """
+    log_buffer += orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def write_log_lines(log_buffer):
+    """
+    Write a buffer of newline-terminated JSON log lines to stdout with a single write call.
+    Anything already printed is flushed first to keep lines in order. This bypasses the
+    text layer, so it must only be called from the thread that does the printing
+    (process_sensor_data), never while another thread may be partway through a print().
+    process_sensor_data flushes stdout once before returning.
+    """
+    if not log_buffer:
+        return
+
+    sys.stdout.flush()
+    sys.stdout.buffer.write(log_buffer)
+
+
+def partition_readings(payload):
+    """
+    Separate status alerts from regular pings in a single pass over the payload.
+    Returns a tuple of (status_readings, pings_by_sensor), where pings_by_sensor
+    maps (sensor_set_id, sensor_id) to the list of ping readings for that sensor.
+    Non-dict readings are ignored.
+    """
+    status_readings = []
+    pings_by_sensor = {}
+    add_status_reading = status_readings.append
+    sensor_pings = pings_by_sensor.setdefault
+
+    # filter() with a built-in predicate skips non-dict readings without a Python-level check
+    for reading in filter(_is_dict, payload):
+        if "status" in reading:
+            add_status_reading(reading)
+        else:
+            try:
+                key = _get_sensor_key(reading)
+            except KeyError:
+                key = (reading.get("sensor_set_id", "Unknown Sensor Set"), reading.get("sensor_id", "Unknown Sensor"))
+            sensor_pings(key, []).append(reading)
+
+    return status_readings, pings_by_sensor
 
 
 def process_status_messages(payload):
     """
-    Process status messages and send notifications.
+    Process status messages and start their notifications.
     This phase also generates the structured logs for both monitoring metrics.
+    Returns (log_buffer, notification_futures). The caller waits on the
+    notifications and then writes the logs, so no other thread is printing
+    while they go straight to stdout's underlying buffer.
     """
-    # Separate status alerts from regular pings
-    status_readings = []
-    ping_readings = []
+    status_readings, pings_by_sensor = partition_readings(payload)
 
-    for reading in payload:
-        if isinstance(reading, dict):
-            if "status" in reading:
-                status_readings.append(reading)
-            else:
-                ping_readings.append(reading)
+    # Boot status alerts are collected and emailed together after the loop
+    boot_statuses = []
+
+    # Notifications run on the send pool and are waited on at the end
+    notification_futures = []
+
+    # Structured log entries are serialized into one buffer and written to stdout together
+    log_buffer = bytearray()
 
     # Process each status alert
     for reading in status_readings:
@@ -328,19 +511,25 @@ def process_status_messages(payload):
         log_name = ""
 
         # Check if this is a battery status message
-        if status_message == "battery" or status_message.startswith("[boot] battery") or status_message.startswith(
-                "[wake] battery"):
-            send_pushover_notification(
+        if status_message == "battery" or status_message.startswith(BATTERY_STATUS_PREFIXES):
+            notification_futures.append(_send_pool.submit(
+                send_pushover_notification,
                 sensor_id,
                 sensor_set_id,
                 status_message,
                 use_battery_token=True,
                 battery_data=reading
-            )
+            ))
             log_message = f"Battery-specific Pushover notification sent for {sensor_id}: V={reading.get('battery_voltage', 'N/A')} %={reading.get('battery_percent', 'N/A')} WiFi={reading.get('wifi_dbm', 'N/A')}dBm"
             log_name = "sensor_status_battery_notification_sent"
         elif status_message.startswith("[boot]"):
-            send_status_notification(sensor_id, sensor_set_id, status_message)
+            boot_statuses.append((sensor_id, sensor_set_id, status_message))
+            notification_futures.append(_send_pool.submit(
+                send_pushover_notification,
+                sensor_id,
+                sensor_set_id,
+                status_message
+            ))
             log_message = f"Boot status notification sent for {sensor_id}: {status_message}"
             log_name = "sensor_status_boot_notification_sent"
         else:
@@ -355,44 +544,61 @@ def process_status_messages(payload):
             "sensor_set_id": sensor_set_id,
             "status": status_message,
             "log_name": log_name,
-            "data_payload": reading
+            "data_payload": log_payload_field(reading)
         }
-        print(json.dumps(info_log_entry))
+        append_log_line(log_buffer, info_log_entry)
 
-    # Group pings by sensor_set and sensor_id for summary logging
-    pings_by_sensor = collections.defaultdict(list)
-    for reading in ping_readings:
-        sensor_id = reading.get("sensor_id", "Unknown Sensor")
-        sensor_set_id = reading.get("sensor_set_id", "Unknown Sensor Set")
-        pings_by_sensor[(sensor_set_id, sensor_id)].append(reading)
+    if boot_statuses:
+        notification_futures.append(_send_pool.submit(send_status_email_batch, boot_statuses))
 
     # Log a single summary message for each group of pings
     for (sensor_set_id, sensor_id), readings in pings_by_sensor.items():
         num_points = len(readings)
+        message_fields = {"num_points": num_points, "sensor_id": sensor_id}
 
-        # Log entry 1: For the absence alert metric (sensor_ping_count)
+        if num_points <= PING_LOG_PAYLOAD_LIMIT:
+            payload_field = readings
+        else:
+            payload_field = {
+                "sample": readings[:PING_LOG_SAMPLE_SIZE],
+                "count": num_points,
+                "omitted": num_points - PING_LOG_SAMPLE_SIZE
+            }
+
+        # One entry per sensor feeds both the absence alert metric (sensor_ping_count)
+        # and the weighted data point metric (sensor_data_points_distribution), which
+        # extracts data_point_count from this same entry.
         ping_log_entry = {
             "severity": "INFO",
-            "message": f"{num_points} data points received from {sensor_id}",
+            "message": PING_LOG_MESSAGE.format_map(message_fields),
             "sensor_id": sensor_id,
             "sensor_set_id": sensor_set_id,
             "log_name": "sensor_status_ping",
-            "data_point_count": num_points,
-            "data_payload": readings # Keeping payload for detailed logs, though metric doesn't use it
+            "data_point_count": num_points,  # Value extracted by sensor_data_points_distribution
+            "data_payload": log_payload_field(payload_field) # Keeping payload for detailed logs, though metrics don't use it
         }
-        print(json.dumps(ping_log_entry))
+        append_log_line(log_buffer, ping_log_entry)
 
-        # Log entry 2: For the weighted counter metric (sensor_data_points_received)
-        # This uses the required log_name and omits the large data_payload for efficiency.
-        data_point_metric_log = {
-            "severity": "INFO",
-            "message": f"Metric point for {sensor_id}: {num_points} data points.",
-            "sensor_id": sensor_id,
-            "sensor_set_id": sensor_set_id,
-            "log_name": "sensor_data_point_metric",
-            "data_point_count": num_points,  # Value extracted by the metric filter
-        }
-        print(json.dumps(data_point_metric_log))
+    return log_buffer, notification_futures
+
+
+def wait_for_notifications(notification_futures, timeout):
+    """
+    Wait up to timeout seconds for the notification sends started by
+    process_status_messages, logging any that failed or didn't finish.
+    Returns True if every send finished, False if some are still running.
+    """
+    try:
+        for future in as_completed(notification_futures, timeout=timeout):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"ERROR: Failed to send notification: {e}")
+    except TimeoutError:
+        pending = sum(not future.done() for future in notification_futures)
+        print(f"ERROR: {pending} notifications still pending after the status processing deadline")
+        return False
+    return True
 
 
 def write_to_cassandra(session, payload):
@@ -427,7 +633,7 @@ def write_to_cassandra(session, payload):
     error_count = 0
 
     for reading in payload:
-        if not isinstance(reading, dict):
+        if type(reading) is not dict and not isinstance(reading, dict):
             print(f"WARN: Skipping non-dict reading: {reading}")
             continue
 
@@ -478,7 +684,7 @@ def write_to_cassandra(session, payload):
             )
 
             # Update latest reading cache
-            update_latest_reading(session, reading, timestamp, ingestion_time)
+            update_latest_reading(session, sensor_id, sensor_set_id, reading, timestamp, ingestion_time)
 
             success_count += 1
 
@@ -496,13 +702,18 @@ def process_sensor_data(cloud_event):
     Triggered by Pub/Sub message. Writes sensor readings to Cassandra
     (conditionally) and processes status notifications (always).
     """
+    started = time.monotonic()
+
     # Decode the Pub/Sub message
     try:
         b64_data = cloud_event.data["message"]["data"]
-        decoded_data = base64.b64decode(b64_data).decode("utf-8")
-        payload = json.loads(decoded_data)
-    except (KeyError, TypeError, json.JSONDecodeError) as e:
+        # json.loads accepts the decoded bytes directly, so skip the str round-trip.
+        # orjson isn't used here because it rejects NaN and Infinity, which the
+        # REST proxy accepts and forwards.
+        payload = json.loads(base64.b64decode(b64_data))
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"ERROR: Could not decode or parse Pub/Sub message. Error: {e}")
+        sys.stdout.flush()
         return
 
     # Expect a list of sensor readings
@@ -510,6 +721,11 @@ def process_sensor_data(cloud_event):
         print(f"WARN: Received non-list payload, converting to list. Payload: {payload}")
         payload = [payload]
 
+    # === Status Messages (Logs and Notifications) ===
+    # This is independent of Cassandra writes and is always enabled for monitoring,
+    # so start it on a worker thread while the Cassandra write runs on this one.
+    status_future = _notify_pool.submit(process_status_messages, payload)
+
     # === PHASE 1: Write to Cassandra (Controlled by Feature Flag) ===
     global ENABLE_CASSANDRA_WRITE
     if ENABLE_CASSANDRA_WRITE:
@@ -521,10 +737,25 @@ def process_sensor_data(cloud_event):
     else:
         print("INFO: Cassandra write skipped due to ENABLE_CASSANDRA_WRITE flag being set to False.")
 
-
-    # === PHASE 2: Process Status Messages (Logs and Notifications) ===
-    # This runs independently of Cassandra writes and is always enabled for monitoring
+    # === PHASE 2: Write Status Logs and Wait for Notifications ===
+    # Only wait as long as the invocation can spare after the Cassandra write
     try:
-        process_status_messages(payload)
+        log_buffer, notification_futures = status_future.result(
+            timeout=max(0, STATUS_PROCESSING_DEADLINE_SECONDS - (time.monotonic() - started))
+        )
     except Exception as e:
-        print(f"ERROR: Failed to process status messages: {e}")
\ No newline at end of file
+        print(f"ERROR: Failed to process status messages: {e}")
+    else:
+        # The send threads print as they go, so let them finish before the logs are
+        # written straight to stdout's buffer; the wait is bounded by the same deadline
+        if wait_for_notifications(
+            notification_futures,
+            max(0, STATUS_PROCESSING_DEADLINE_SECONDS - (time.monotonic() - started))
+        ):
+            write_log_lines(log_buffer)
+        else:
+            # Sends still running may print at any moment, so go through the text
+            # layer, which keeps their lines and the log lines from being spliced
+            sys.stdout.write(log_buffer.decode())
+
+    sys.stdout.flush()
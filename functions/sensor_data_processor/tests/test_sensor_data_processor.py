@@ -0,0 +1,70 @@
+"""
+test_sensor_data_processor.py
+
+Tests for the Pub/Sub to Cassandra sensor data processor Cloud Function.
+
+Copyright (c) 2025 Caden Howell (cadenhowell@gmail.com)
+Developed with assistance from Claude Sonnet 4.5 (2025).
+Apache 2.0 Licensed as described in the file LICENSE
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import base64
+
+# Imported by package path only: the other functions' tests patch their own
+# top-level "main" module, which this directory must not shadow on sys.path.
+from functions.sensor_data_processor.src import main
+
+
+def make_cloud_event(raw_body):
+    """Wrap a raw message body the way Pub/Sub delivers it to the function."""
+    cloud_event = MagicMock()
+    cloud_event.data = {"message": {"data": base64.b64encode(raw_body).decode("ascii")}}
+    return cloud_event
+
+
+class TestProcessSensorData(unittest.TestCase):
+    @patch.object(main, 'ENABLE_CASSANDRA_WRITE', True)
+    @patch.object(main, 'write_log_lines')
+    @patch.object(main, 'send_status_email_batch')
+    @patch.object(main, 'send_pushover_notification')
+    @patch.object(main, 'write_to_cassandra')
+    @patch.object(main, 'get_cassandra_session')
+    def test_nan_values_accepted(self, mock_get_session, mock_write_to_cassandra,
+                                 mock_send_pushover, mock_send_email, mock_write_log_lines):
+        """
+        Tests that a message with NaN values, which the REST proxy accepts and
+        forwards, is still written, logged and notified rather than dropped.
+        """
+        raw_body = b'[{"sensor_id":"s1","sensor_set_id":"backyard","light_intensity":NaN},' \
+                   b'{"sensor_id":"s2","sensor_set_id":"backyard","status":"[boot] x"}]'
+
+        main.process_sensor_data(make_cloud_event(raw_body))
+
+        # Both readings reach Cassandra
+        payload = mock_write_to_cassandra.call_args.args[1]
+        self.assertEqual(len(payload), 2)
+        self.assertEqual(payload[0]["sensor_id"], "s1")
+
+        # The boot status is notified
+        mock_send_pushover.assert_called_once_with("s2", "backyard", "[boot] x")
+        mock_send_email.assert_called_once_with([("s2", "backyard", "[boot] x")])
+
+        # The ping log entry is written, with NaN logged as null
+        log_buffer = bytes(mock_write_log_lines.call_args.args[0])
+        self.assertIn(b'"log_name":"sensor_status_ping"', log_buffer)
+        self.assertIn(b'"light_intensity":null', log_buffer)
+
+    @patch.object(main, 'write_to_cassandra')
+    @patch.object(main, 'get_cassandra_session')
+    def test_invalid_json_message(self, mock_get_session, mock_write_to_cassandra):
+        """
+        Tests that a message that is not valid JSON is logged and skipped.
+        """
+        main.process_sensor_data(make_cloud_event(b'[{"sensor_id": '))
+        mock_write_to_cassandra.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ Creates a timestamped backup of key BigQuery tables.
 This script performs the following actions:
 1. Creates a new BigQuery dataset with a name like 'backup_20250520T123000Z'.
 2. Copies a predefined list of tables from the source dataset ('sunlight_data')
-   into the newly created backup dataset.
+   into the newly created backup dataset. The copy jobs run concurrently.
 
 Prerequisites:
   - The `google-cloud-bigquery` library must be installed.
@@ -22,6 +22,7 @@ Apache 2.0 Licensed as described in the file LICENSE
 import os
 from datetime import datetime, timezone
 from google.cloud import bigquery
+from bq_client import get_bq_client
 
 # --- Configuration ---
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
@@ -44,7 +45,7 @@ def backup_bq_tables():
     if not PROJECT_ID:
         raise ValueError("The GCP_PROJECT_ID environment variable is not set.")
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bq_client(PROJECT_ID, location=LOCATION)
 
     # 1. Generate a unique, timestamped name for the backup dataset
     timestamp_str = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
@@ -62,22 +63,30 @@ def backup_bq_tables():
         print(f"Failed to create dataset: {e}")
         raise
 
-    # 3. Loop through and copy each table
+    # 3. Start a copy job for each table. Copy jobs run server-side, so start
+    # them all before waiting on any of them.
     print(f"\nStarting copy of {len(TABLES_TO_BACKUP)} tables from '{SOURCE_DATASET_ID}'...")
+    copy_jobs = []
     for table_id in TABLES_TO_BACKUP:
         source_table_ref = f"{PROJECT_ID}.{SOURCE_DATASET_ID}.{table_id}"
         dest_table_ref = f"{backup_dataset_ref}.{table_id}"
 
         try:
-            print(f"  - Copying '{table_id}'...")
-            copy_job = client.copy_table(source_table_ref, dest_table_ref)
-            copy_job.result()  # Wait for the job to complete
-            print(f"    ...Success.")
+            print(f"  - Starting copy of '{table_id}'...")
+            copy_jobs.append((table_id, client.copy_table(source_table_ref, dest_table_ref)))
         except Exception as e:
-            print(f"    ...FAILED to copy table '{table_id}'. Reason: {e}")
+            print(f"    ...FAILED to start copy of table '{table_id}'. Reason: {e}")
             # Continue to the next table even if one fails
             continue
 
+    # 4. Wait for all of the copy jobs to complete
+    for table_id, copy_job in copy_jobs:
+        try:
+            copy_job.result()  # Wait for the job to complete
+            print(f"  - Copied '{table_id}'.")
+        except Exception as e:
+            print(f"  - FAILED to copy table '{table_id}'. Reason: {e}")
+
     print("\nBackup process completed.")
 
 
@@ -0,0 +1,38 @@
+"""
+bq_client.py
+
+Shared BigQuery client for the BigQuery backup maintenance scripts.
+
+The client is created on first use and then reused, so credentials are only
+looked up once. Its HTTP session keeps a pool of connections open, so each
+BigQuery API call made by the scripts reuses a warm TLS connection instead of
+opening a new one.
+
+Copyright (c) 2025 Caden Howell (cadenhowell@gmail.com)
+Developed with assistance from ChatGPT 4o (2025) and Google Gemini 2.5 Pro (2025).
+Apache 2.0 Licensed as described in the file LICENSE
+"""
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery
+from requests.adapters import HTTPAdapter
+
+BIGQUERY_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+# Enough connections for every concurrent copy or delete the scripts run
+HTTP_POOL_SIZE = 16
+
+_client = None
+
+
+def get_bq_client(project_id, location=None):
+    """
+    Return the shared BigQuery client, creating it on the first call.
+    Jobs and requests that don't specify a location default to `location`.
+    """
+    global _client
+    if _client is None:
+        credentials, _ = google.auth.default(scopes=BIGQUERY_SCOPES)
+        http = AuthorizedSession(credentials)
+        http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE))
+        _client = bigquery.Client(project=project_id, location=location, _http=http)
+    return _client
@@ -18,8 +18,9 @@ Apache 2.0 Licensed as described in the file LICENSE
 
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from google.cloud import bigquery
+from bq_client import get_bq_client
 
 # --- Configuration ---
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
@@ -28,6 +29,8 @@ BACKUP_PREFIX = "backup_"
 TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
 # Define how many days to keep backups. Backups older than this will be deleted.
 RETENTION_DAYS = 30
+# Number of dataset deletions allowed to run at once.
+MAX_CONCURRENT_DELETES = 8
 
 
 def cleanup_old_backups():
@@ -35,17 +38,22 @@ def cleanup_old_backups():
     if not PROJECT_ID:
         raise ValueError("The GCP_PROJECT_ID environment variable is not set.")
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bq_client(PROJECT_ID)
     retention_limit = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
 
     print(f"Scanning for backup datasets older than {RETENTION_DAYS} days (created before {retention_limit.date()})...")
 
-    datasets = list(client.list_datasets())
+    # Backup names embed a UTC timestamp that sorts chronologically, so any name
+    # after the cutoff name is too new to delete and doesn't need to be parsed.
+    retention_cutoff_id = BACKUP_PREFIX + retention_limit.strftime(TIMESTAMP_FORMAT)
     datasets_to_delete = []
 
-    for dataset in datasets:
+    # Iterate the pages as they arrive rather than loading every dataset first
+    for dataset in client.list_datasets(page_size=200):
         dataset_id = dataset.dataset_id
         if dataset_id.startswith(BACKUP_PREFIX):
+            if dataset_id > retention_cutoff_id:
+                continue
             timestamp_part = dataset_id.replace(BACKUP_PREFIX, "")
             try:
                 # Parse the timestamp from the dataset name
@@ -68,13 +76,20 @@ def cleanup_old_backups():
     confirm = input("Are you sure you want to permanently delete these datasets and all their tables? (y/n): ")
 
     if confirm.lower() == 'y':
-        for dataset in datasets_to_delete:
-            print(f"  - Deleting '{dataset.dataset_id}'...")
-            try:
-                client.delete_dataset(dataset, delete_contents=True)
-                print("    ...Success.")
-            except Exception as e:
-                print(f"    ...FAILED to delete dataset. Reason: {e}")
+        # Each deletion blocks until BigQuery finishes it, so run them concurrently
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DELETES) as executor:
+            futures = {}
+            for dataset in datasets_to_delete:
+                print(f"  - Deleting '{dataset.dataset_id}'...")
+                futures[executor.submit(client.delete_dataset, dataset, delete_contents=True)] = dataset
+
+            for future in as_completed(futures):
+                dataset_id = futures[future].dataset_id
+                try:
+                    future.result()
+                    print(f"    ...Deleted '{dataset_id}'.")
+                except Exception as e:
+                    print(f"    ...FAILED to delete '{dataset_id}'. Reason: {e}")
         print("\nCleanup process completed.")
     else:
         print("\nCleanup aborted by user.")
@@ -11,10 +11,13 @@ Developed with assistance from ChatGPT 4o (2025) and Google Gemini 2.5 Pro (2025
 Apache 2.0 Licensed as described in the file LICENSE
 """
 
-import math
 import os
-import random
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pytz import timezone
 
@@ -23,27 +26,49 @@ SENSOR_ID = os.getenv('SENSOR_ID', 'test_sensor')
 SENSOR_API_URL = os.getenv('SENSOR_API_URL', '')
 BEARER_TOKEN = os.getenv('BEARER_TOKEN', 'xxx')
 MAX_LUX = 10000
+# Number of POST requests to the sensor API allowed in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+# Maximum records per POST. The API publishes each request body as a single
+# Pub/Sub message, and sensor-data-processor writes every reading in it to
+# Cassandra one at a time within a 60s timeout. One sensor-day (1440 readings)
+# is what a single invocation is known to handle.
+MAX_BATCH_SIZE = 1440
+
+# Shared HTTP session so every request reuses a pooled keep-alive connection.
+# Gateway errors are retried with backoff; duplicate test data is harmless.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_CONCURRENT_REQUESTS,
+    max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504), allowed_methods=None)
+))
+session.headers.update({
+    'Authorization': f'Bearer {BEARER_TOKEN}',
+    'Content-Type': 'application/json'
+})
 
 def generate_light_intensity(minute, phase_shift=0):
     """
     Generate light intensity based on sine wave and bell curve with an optional phase shift.
+    Uses NumPy ufuncs, so minute and phase_shift may also be arrays, in which case
+    they are broadcast against each other and an array of intensities is returned.
 
     Args:
-        minute (int): Minute of the day (0-1439)
-        phase_shift (float): Phase shift in radians to offset the sine wave
+        minute (int or np.ndarray): Minute of the day (0-1439)
+        phase_shift (float or np.ndarray): Phase shift in radians to offset the sine wave
 
     Returns:
-        float: Light intensity between 10 and MAX_LUX
+        float or np.ndarray: Light intensity between 10 and MAX_LUX
     """
     # Sine wave component
     period_minutes = 120  # 2 hours
-    radians = (2 * math.pi * minute) / period_minutes + phase_shift
-    sine_value = (math.sin(radians) + 1) / 2  # Normalize sine to [0,1]
+    radians = (2 * np.pi * minute) / period_minutes + phase_shift
+    sine_value = (np.sin(radians) + 1) / 2  # Normalize sine to [0,1]
 
     # Bell curve (Gaussian) component
     peak_minute = 720  # Midday
     std_dev = 300  # Controls the width of the bell curve
-    bell_curve = math.exp(-((minute - peak_minute) ** 2) / (2 * std_dev ** 2))
+    bell_curve = np.exp(-((minute - peak_minute) ** 2) / (2 * std_dev ** 2))
 
     # Combine sine wave and bell curve
     max_intensity = bell_curve * (MAX_LUX - 10)  # Scale bell curve to max intensity
@@ -51,48 +76,75 @@ def generate_light_intensity(minute, phase_shift=0):
     return light
 
 
+def send_records(batch_number, records):
+    """
+    Send a batch of records to the sensor API.
+
+    Args:
+        batch_number (int): Index of the batch being sent, for logging
+        records (list): Sensor readings to send, possibly spanning several sensors and days
+    """
+    try:
+        response = session.post(SENSOR_API_URL, data=orjson.dumps(records))
+        print(f"Sent {len(records)} records in batch {batch_number+1} -> Status {response.status_code}")
+        if not response.ok:
+            print(f"Error response: {response.text}")
+    except Exception as e:
+        print(f"Failed to send data: {e}")
+
+
 def main():
     # Define CST timezone using pytz
     cst = timezone('America/Chicago')
 
-    headers = {
-        'Authorization': f'Bearer {BEARER_TOKEN}',
-        'Content-Type': 'application/json'
-    }
-
     # For 4 sensors, each with a phase shift of 0, π/2, π, and 3π/2
-    # create a day's worth of data in a sine wave pattern (arbitrary continuous changing function)
-    for day in range(7):
-        start_time_cst = datetime.now(cst).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7 - day)
-        start_time_utc = start_time_cst.astimezone(timezone('UTC'))
-
-        for sensor_number in range(4):
-            sensor_id = SENSOR_ID + '_' + str(sensor_number)
-            phase_shift = (sensor_number * math.pi) / 2
-
-            records = []
-            for minute in range(1440): # One day's worth of data
-                random_offset = random.randint(-5, 5)
-                timestamp = start_time_utc + timedelta(minutes=minute, seconds=random_offset)
-                iso_timestamp = timestamp.isoformat().replace('+00:00', 'Z')
-
-                light_intensity = generate_light_intensity(minute, phase_shift)
-
-                record = {
-                    "light_intensity": light_intensity,
-                    "sensor_id": sensor_id,
-                    "timestamp": iso_timestamp,
-                    "sensor_set_id": "test"
-                }
-                records.append(record)
-
-            try:
-                response = requests.post(SENSOR_API_URL, headers=headers, json=records)
-                print(f"Sent {len(records)} records for sensor {sensor_id} for day {day+1} -> Status {response.status_code}")
-                if not response.ok:
-                    print(f"Error response: {response.text}")
-            except Exception as e:
-                print(f"Failed to send data: {e}")
+    # create a day's worth of data in a sine wave pattern (arbitrary continuous changing function).
+    # The pattern is the same every day, so compute the (sensor, minute) grid once up front.
+    minutes = np.arange(1440)
+    minute_offsets = minutes * 60
+    phase_shifts = np.arange(4)[:, np.newaxis] * (np.pi / 2)
+    intensities = generate_light_intensity(minutes, phase_shifts).tolist()
+    sensor_ids = [f"{SENSOR_ID}_{sensor_number}" for sensor_number in range(4)]
+
+    # Records are packed into batches of up to MAX_BATCH_SIZE, sized so each batch can be
+    # processed by a single sensor-data-processor invocation. Batches go out on a thread pool
+    # over the shared session, so they overlap with each other and with building the next batch.
+    batch = []
+    batch_count = 0
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        for day in range(7):
+            start_time_cst = datetime.now(cst).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7 - day)
+            start_epoch = int(start_time_cst.timestamp())
+
+            # One day's worth of per-minute timestamps for every sensor, each jittered by up to
+            # 5 seconds either way, formatted as ISO 8601 UTC strings in a single NumPy call.
+            epoch_seconds = start_epoch + minute_offsets + np.random.randint(-5, 6, size=(4, 1440))
+            timestamps = np.datetime_as_string(epoch_seconds.astype('datetime64[s]'), unit='s', timezone='UTC').tolist()
+
+            for sensor_number in range(4):
+                sensor_id = sensor_ids[sensor_number]
+                sensor_intensities = intensities[sensor_number]
+                sensor_timestamps = timestamps[sensor_number]
+
+                for minute in range(1440): # One day's worth of data
+                    iso_timestamp = sensor_timestamps[minute]
+                    light_intensity = sensor_intensities[minute]
+
+                    record = {
+                        "light_intensity": light_intensity,
+                        "sensor_id": sensor_id,
+                        "timestamp": iso_timestamp,
+                        "sensor_set_id": "test"
+                    }
+                    batch.append(record)
+
+                    if len(batch) == MAX_BATCH_SIZE:
+                        executor.submit(send_records, batch_count, batch)
+                        batch = []
+                        batch_count += 1
+
+        if batch:
+            executor.submit(send_records, batch_count, batch)
 
 
 if __name__ == '__main__':
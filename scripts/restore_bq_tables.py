@@ -8,7 +8,7 @@ This script performs the following actions:
 2. Prompts the user to select which backup dataset to restore from.
 3. Asks for explicit confirmation, as this is a destructive operation.
 4. Copies all tables from the selected backup dataset to the live
-   'sunlight_data', overwriting any existing data.
+   'sunlight_data', overwriting any existing data. The copy jobs run concurrently.
 
 Prerequisites:
   - The `google-cloud-bigquery` library must be installed.
@@ -23,6 +23,7 @@ Apache 2.0 Licensed as described in the file LICENSE
 """
 import os
 from google.cloud import bigquery
+from bq_client import get_bq_client
 
 # --- Configuration ---
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
@@ -35,7 +36,7 @@ def restore_bq_from_backup():
     if not PROJECT_ID:
         raise ValueError("The GCP_PROJECT_ID environment variable is not set.")
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bq_client(PROJECT_ID)
 
     # 1. Find and list all available backup datasets
     print("Searching for available backups...")
@@ -92,22 +93,25 @@ def restore_bq_from_backup():
             print(f"The backup dataset '{source_dataset_ref.dataset_id}' is empty. Nothing to restore.")
             return
 
+        # Configure the copy jobs to overwrite the destination tables
+        job_config = bigquery.CopyJobConfig(
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+        )
+
+        # Copy jobs run server-side, so start them all before waiting on any of them
+        copy_jobs = []
         for table in tables_to_restore:
             source_table_ref = f"{source_dataset_ref.project}.{source_dataset_ref.dataset_id}.{table.table_id}"
             dest_table_ref = f"{PROJECT_ID}.{LIVE_DATASET_ID}.{table.table_id}"
 
             print(f"  - Restoring '{table.table_id}'...")
-
-            # Configure the copy job to overwrite the destination table
-            job_config = bigquery.CopyJobConfig(
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-
-            copy_job = client.copy_table(
+            copy_jobs.append((table.table_id, client.copy_table(
                 source_table_ref, dest_table_ref, job_config=job_config
-            )
+            )))
+
+        for table_id, copy_job in copy_jobs:
             copy_job.result()  # Wait for the job to complete
-            print("    ...Success.")
+            print(f"  - Restored '{table_id}'.")
 
     except Exception as e:
         print(f"\nAn unexpected error occurred during the restore process: {e}")
@@ -83,18 +83,21 @@ resource "google_logging_metric" "sensor_ping_count" {
   }
 }
 
-# Metric 2: Count data point events, weighted by the number of points (alternative approach)
-# This creates a custom metric that we can populate from the Cloud Function
+# Metric 2: Count data points, weighted by the number of points in each ping summary.
+# Reads data_point_count from the same sensor_status_ping entries as Metric 1,
+# so the function only writes one log entry per sensor per message.
+# A log-based metric's value type can't be changed in place, so this
+# DISTRIBUTION metric uses a new name rather than the old INT64
+# sensor_data_points_received counter.
 resource "google_logging_metric" "sensor_data_points" {
   project = var.gcp_project_id
-  name    = "sensor_data_points_received"
+  name    = "sensor_data_points_distribution"
 
-  # Filter for a special log entry that the function will create for data points
-  filter = "resource.type=\"cloud_run_revision\" AND resource.labels.service_name=\"sensor-status-monitor-function\" AND jsonPayload.log_name=\"sensor_data_point_metric\" AND jsonPayload.sensor_set_id != \"test\""
+  filter = "resource.type=\"cloud_run_revision\" AND resource.labels.service_name=\"sensor-data-processor\" AND jsonPayload.log_name=\"sensor_status_ping\" AND jsonPayload.sensor_set_id != \"test\""
 
   metric_descriptor {
     metric_kind = "DELTA"
-    value_type  = "INT64"
+    value_type  = "DISTRIBUTION"
     labels {
       key         = "sensor_id"
       value_type  = "STRING"
@@ -108,11 +111,21 @@ resource "google_logging_metric" "sensor_data_points" {
   }
 
   # Extract the data_point_count from the log message
+  value_extractor = "EXTRACT(jsonPayload.data_point_count)"
+
   label_extractors = {
     "sensor_id"     = "EXTRACT(jsonPayload.sensor_id)"
     "sensor_set_id" = "EXTRACT(jsonPayload.sensor_set_id)"
   }
 
+  bucket_options {
+    exponential_buckets {
+      num_finite_buckets = 16
+      growth_factor      = 2
+      scale              = 1
+    }
+  }
+
   lifecycle {
     # Prevent recreation if only metadata changes
     ignore_changes = [
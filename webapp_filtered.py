@@ -9,11 +9,177 @@
 #  Apache 2.0 Licensed as described in the file LICENSE
 
 
+import io
 import os
-import glob
+import atexit
+import json
+import re
+import sys
+import shutil
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+
+COPY_CHUNK_SIZE = 1 << 20  # Files are streamed to stdout in chunks of this many bytes
+SCAN_CHUNK_SIZE = 64 * 1024  # Files are scanned for keywords in chunks of this many bytes
+SCAN_WORKERS = 32  # Number of files scanned for keywords at once
+OUTPUT_BUFFER_SIZE = 1 << 20  # Output is collected into writes of this many bytes
+FILE_HEADER = b"----------\n%s\n----------\n"  # Printed before each file's contents, with its path filled in
+KEYWORD_CACHE_PATH = os.path.join(".cache", "webapp_kw.json")  # Keyword scan results saved between runs
+
+
+def scan_dir(path):
+    """List a directory's entries sorted by name, or nothing if it can't be read."""
+    try:
+        with os.scandir(path or os.curdir) as it:
+            return sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+def is_excluded(name, exclude_re):
+    """Check whether a file or directory name contains any of the exclude patterns."""
+    return exclude_re is not None and exclude_re.search(name) is not None
+
+
+def expand_globstars(states):
+    """Add the zero-directory match of each leading "**" to a set of pattern states."""
+    expanded = set()
+    for index, parts in states:
+        expanded.add((index, parts))
+        while parts[0] == "**" and len(parts) > 1:
+            parts = parts[1:]
+            expanded.add((index, parts))
+    return expanded
+
+
+def match_patterns(base, states, exclude_re):
+    """
+    Yield (pattern index, path) for files under base matching any pattern state.
+    Each state is a pattern's index and its remaining parts, so a directory is
+    listed once no matter how many patterns still need to look inside it.
+    """
+    states = expand_globstars(states)
+    for entry in scan_dir(base):
+        name = entry.name
+        if is_excluded(name, exclude_re):
+            continue
+        hidden = name.startswith(".")
+        is_dir = entry.is_dir()
+        child_states = set()
+        matched_index = None
+
+        for index, parts in states:
+            part, rest = parts[0], parts[1:]
+            if part == "**":
+                # "**" matches zero or more directories
+                if is_dir and not hidden:
+                    child_states.add((index, parts))
+            # Like glob, wildcards don't match hidden names unless the pattern part is hidden too
+            elif (hidden and not part.startswith(".")) or not fnmatch.fnmatchcase(name, part):
+                continue
+            elif rest:
+                if is_dir:
+                    child_states.add((index, rest))
+            elif matched_index is None or index < matched_index:
+                matched_index = index
+
+        path = os.path.join(base, name)
+        if matched_index is not None and entry.is_file():
+            yield matched_index, path
+        if child_states:
+            yield from match_patterns(path, child_states, exclude_re)
+
+
+def open_sequential(path):
+    """
+    Open a file for binary reading and tell the kernel it will be read start to
+    finish, so readahead can fetch it into the page cache ahead of the reads.
+    """
+    f = open(path, 'rb')
+    if hasattr(os, "posix_fadvise"):  # Not available on Windows or macOS
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # The hint is optional; read the file normally without it
+    return f
+
+
+def read_if_match(f, pattern, overlap):
+    """
+    Scan an open binary file for a regex match chunk by chunk, stopping at the
+    first hit. Each chunk is searched together with the last `overlap` bytes of
+    the previous one, so matches spanning a chunk boundary are still found.
+    Returns the whole file content on a match, reusing the chunks already
+    read so the file is only read once, or None if nothing matched.
+    """
+    chunks = []
+    tail = b""
+    while chunk := f.read(SCAN_CHUNK_SIZE):
+        chunks.append(chunk)
+        if pattern.search(tail + chunk):
+            chunks.append(f.read())
+            return b"".join(chunks)
+        tail = chunk[-overlap:] if overlap else b""
+    return None
+
+
+def file_stamp(path):
+    """Return a file's (mtime_ns, size), which changes whenever the file is rewritten."""
+    stat_result = os.stat(path)
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def load_keyword_cache(keywords):
+    """
+    Load the saved keyword scan results, a dict of path -> (stamp, matched).
+    Results saved for a different keyword list are discarded.
+    """
+    try:
+        with open(KEYWORD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache["keywords"] == keywords:
+            # JSON has no tuples, so stamps come back as lists
+            return {path: (tuple(stamp), matched) for path, (stamp, matched) in cache["files"].items()}
+    except Exception:
+        pass  # A missing or unreadable cache just means every file is scanned
+    return {}
+
+
+def save_keyword_cache(keywords, files):
+    """Save keyword scan results for the next run, replacing the old cache atomically."""
+    os.makedirs(os.path.dirname(KEYWORD_CACHE_PATH), exist_ok=True)
+    temp_path = KEYWORD_CACHE_PATH + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"keywords": keywords, "files": files}, f)
+    os.replace(temp_path, KEYWORD_CACHE_PATH)
+
+
+def find_file_groups(pattern_groups, exclude_re=None):
+    """
+    Find the files matching each group of recursive glob patterns in a single
+    walk of the tree with os.scandir, whose entries already know whether they are
+    files or directories, so no path needs a separate stat() call. Every directory
+    is listed at most once, in sorted order, however many patterns look inside it.
+    Names matching exclude_re are skipped as they are listed, so
+    excluded directories like node_modules are never descended into.
+    Patterns are normalized first, so "./terraform/*.tf" and "terraform/*.tf"
+    yield the same paths and dedup against each other.
+    Returns one list of files per group, in pattern order. A file matching
+    several patterns is listed once, under the first of them.
+    """
+    patterns = [pattern for group in pattern_groups for pattern in group]
+    states = {(index, tuple(os.path.normpath(pattern).split(os.sep))) for index, pattern in enumerate(patterns)}
+    # The sort is stable, so files matched by the same pattern keep their walk order
+    matches = sorted(match_patterns("", states, exclude_re), key=lambda match: match[0])
+
+    groups = []
+    group_end = 0
+    for group in pattern_groups:
+        group_start, group_end = group_end, group_end + len(group)
+        groups.append([path for index, path in matches if group_start <= index < group_end])
+    return groups
 
 # First loop - include all files
-print("=== All specified files ===\n")
 patterns = [
     "terraform/terraform.tfvars_example",
     "terraform/shared.tf",
@@ -28,24 +194,7 @@ patterns = [
     # "README.md",
 ]
 
-exclude_patterns = ["__test__", "node_modules", ".next", ".swc", ".env.local"]  # paths containing these will be excluded
-first_loop_files = set()  # Track files from first loop
-
-for pattern in patterns:
-    for file in glob.glob(pattern, recursive=True):
-        if os.path.isfile(file):
-            # Check if any exclude pattern is in the file path
-            if not any(exclude in file for exclude in exclude_patterns):
-                first_loop_files.add(file)  # Add to tracking set
-                print("----------")
-                print(file)
-                print("----------")
-                with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                    print(f.read())
-                print("\n")
-
-            # Second loop - only include files containing specific keywords
-print("=== Filtered files (containing keywords) ===\n")
+# Second loop - only include files containing specific keywords
 filtered_patterns = [
     "sunlight_web_app/**/*.tsx",
     "sunlight_web_app/**/*.ts",
@@ -54,24 +203,101 @@ filtered_patterns = [
     "functions/**/*"
 ]
 
+exclude_patterns = ["__test__", "node_modules", ".next", ".swc", ".env.local"]  # files and directories whose names contain these are skipped
+# One alternation checks every exclude in a single scan of each name
+exclude_re = re.compile("|".join(map(re.escape, exclude_patterns)))
+
+# Both loops' files are found in one walk, visiting each directory once. A file
+# matched by both groups is only in the first, so nothing is printed twice.
+specified_files, candidate_files = find_file_groups([patterns, filtered_patterns], exclude_re)
+
+# Generated and binary files are never worth dumping, so they are dropped by name before any read
+skip_scan_extensions = {".pyc", ".pyo", ".so", ".map", ".lock", ".sum", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".zip", ".woff", ".woff2"}
+skip_scan_names = {"package-lock.json"}
+candidate_files = [
+    file for file in candidate_files
+    if os.path.basename(file) not in skip_scan_names
+    and os.path.splitext(file)[1].lower() not in skip_scan_extensions
+]
+
 keywords = ["firebase", "webapp", "cassandra", "datastax", "astra"]  # your list of keywords
-exclude_patterns = ["__test__", "node_modules", ".next", ".swc", ".env.local"]  # paths containing these will be excluded
-first_loop_files = set()  # Track files from first loop
-
-for pattern in filtered_patterns:
-    for file in glob.glob(pattern, recursive=True):
-        # Exclude if already in first loop
-        if os.path.isfile(file) and file not in first_loop_files:
-            if not any(exclude in file for exclude in exclude_patterns):
-                try:
-                    with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        # Check if any keyword appears in the file (case insensitive)
-                        if any(keyword.lower() in content.lower() for keyword in keywords):
-                            print("----------")
-                            print(file)
-                            print("----------")
-                            print(content)
-                            print("\n")
-                except Exception as e:
-                    print(f"Error reading {file}: {e}\n")
\ No newline at end of file
+# One case-insensitive alternation finds any keyword in a single scan of the raw bytes
+keyword_re = re.compile(b"|".join(re.escape(keyword.encode()) for keyword in keywords), re.IGNORECASE)
+keyword_overlap = max(len(keyword) for keyword in keywords) - 1
+
+
+def scan_file(file):
+    """
+    Check one file for keywords, returning (matched, content, error).
+    content holds the file's bytes when it matched, so it doesn't have to be read again.
+    """
+    try:
+        with open_sequential(file) as f:
+            # Check if any keyword appears in the file (case insensitive), reading only
+            # as far as the first match; keywords are usually near the top
+            content = read_if_match(f, keyword_re, keyword_overlap)
+            return content is not None, content, None
+    except Exception as e:
+        return False, None, e
+
+
+# All output goes through one large buffer on stdout's file descriptor, so the
+# whole dump is written with a handful of write() calls instead of one per line
+out = io.open(sys.stdout.fileno(), 'wb', buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+atexit.register(out.flush)  # Flushed on exit, including if the script stops on an error
+
+out.write(b"=== All specified files ===\n\n")
+for file in specified_files:
+    out.write(FILE_HEADER % file.encode())
+    # Copy the raw bytes straight to the output rather than decoding the whole file into a str
+    with open_sequential(file) as f:
+        shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+    out.write(b"\n\n\n")
+
+out.write(b"=== Filtered files (containing keywords) ===\n\n")
+# Files unchanged since the last run reuse its keyword result, so a warm run only
+# stats them. Only files seen this run are saved, which drops deleted files.
+keyword_cache = load_keyword_cache(keywords)
+updated_keyword_cache = {}
+
+# Keyword scans are I/O bound, so run them concurrently; results are collected
+# in candidate order, so files are still printed in pattern order
+with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+    scans = []
+    for file in candidate_files:
+        try:
+            stamp = file_stamp(file)
+        except OSError:
+            stamp = None  # Let the scan report the error
+        cached = keyword_cache.get(file)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            scans.append((file, stamp, None, cached[1]))
+        else:
+            scans.append((file, stamp, executor.submit(scan_file, file), None))
+
+    for file, stamp, future, cached_match in scans:
+        if future is None:
+            matched, content, error = cached_match, None, None
+        else:
+            matched, content, error = future.result()
+        if error is None and stamp is not None:
+            updated_keyword_cache[file] = (stamp, matched)
+
+        if error is not None:
+            out.write(f"Error reading {file}: {error}\n\n".encode())
+            continue
+        if not matched:
+            continue
+        try:
+            out.write(FILE_HEADER % file.encode())
+            if content is not None:
+                out.write(content)
+            else:
+                # Matched on an earlier run and unchanged since, so it wasn't read this run
+                with open_sequential(file) as f:
+                    shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+            out.write(b"\n\n\n")
+        except Exception as e:
+            out.write(f"Error reading {file}: {e}\n\n".encode())
+
+save_keyword_cache(keywords, updated_keyword_cache)